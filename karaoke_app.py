@@ -1,32 +1,56 @@
+import functools
+import io
 import os
 import random
 import re
 import hashlib
-from typing import Optional, List, Dict, Set
+import time
+from typing import Optional, List, Dict, Set, Tuple
 from datetime import datetime
 from pathlib import Path  # for robust logo path
 
 import streamlit as st
 import pandas as pd
 from google.cloud import firestore
+from PIL import Image  # ships with streamlit
 
 # --- Page config MUST be first ---
 st.set_page_config(page_title="Song Selection", layout="centered")
 
 # ------------ Config / Secrets ------------
-HEADERS = ["timestamp", "name", "phone", "instagram", "song", "suggestion"]
+HEADERS = ("timestamp", "name", "phone", "instagram", "song", "suggestion")  # immutable; one constant
 HOST_PIN = os.getenv("HOST_PIN")  # Fail-closed if not provided
 FIRESTORE_PROJECT = os.getenv("FIRESTORE_PROJECT")  # optional; defaults to current project
+RESET_MAX_RETRIES = 3  # per delete; BulkWriter's default of 15 with linear backoff can stall Reset ~105s
+PENDING_CLAIM_TTL = 5  # seconds to overlay our own new claim; must exceed fs_claimed_songs' ttl
 
 # ------------ Helpers ------------
+_NON_DIGITS = re.compile(r"\D+")
+
+
+def digits_only(raw) -> str:
+    """Strip everything but digits in one C-level pass (runs on every rerun for phone fields)."""
+    return _NON_DIGITS.sub("", str(raw or ""))
+
+
 def normalize_us_phone(raw: str) -> str:
     """Return a 10-digit US number. Accepts 11-digit NANP with leading '1'."""
-    digits = "".join(ch for ch in str(raw or "") if ch.isdigit())
+    digits = digits_only(raw)
     if len(digits) == 11 and digits.startswith("1"):
         digits = digits[1:]
     return digits
 
 
+_MD_ESCAPE = str.maketrans({"*": r"\*", "_": r"\_", "`": r"\`", "~": r"\~"})
+
+
+@functools.lru_cache(maxsize=2048)
+def md_escape(text: str) -> str:
+    """Escape markdown emphasis/code/strike characters in one pass (user text inside st.markdown).
+    Memoized: the same titles/names are re-rendered on every rerun of every session."""
+    return str(text or "").translate(_MD_ESCAPE)
+
+
 def song_doc_id(song: str) -> str:
     """
     Stable, safe doc id for song claims.
@@ -66,7 +90,7 @@ def key_from_record(rec: Dict[str, str]) -> tuple:
     """Normalize a record into our stable queue key: (name_lower, digits_phone, song)."""
     return (
         str(rec.get("name", "")).strip().lower(),
-        "".join(ch for ch in str(rec.get("phone", "")) if ch.isdigit()),
+        digits_only(rec.get("phone", "")),
         str(rec.get("song", "")).strip(),
     )
 
@@ -157,50 +181,53 @@ def bump_version(state: dict):
     state["version"] = int(state.get("version", 0)) + 1
 
 
+def drop_key_from_state(state: dict, key: tuple) -> bool:
+    """Remove `key` from now/order/used in one pass per list. Returns True if anything changed."""
+    changed = False
+    if state.get("now_key") == key:
+        state["now_key"] = None
+        changed = True
+    for field in ("order_keys", "used_keys"):
+        keys = state.get(field, [])
+        kept = [k for k in keys if k != key]
+        if len(kept) != len(keys):
+            state[field] = kept
+            changed = True
+    return changed
+
+
 # ------------ Songs (Firestore) ------------
 @st.cache_data(ttl=120, show_spinner=False)
-def fs_load_songs() -> List[str]:
-    docs = list(db.collection(COL_SONGS).stream())
-    titles = []
-    for d in docs:
-        data = d.to_dict() or {}
-        t = str(data.get("title", "")).strip()
+def fs_load_songs() -> Tuple[str, ...]:
+    # de-dup in a single pass over the stream; order is set by the final sort
+    titles: Set[str] = set()
+    for d in db.collection(COL_SONGS).stream():
+        t = str((d.to_dict() or {}).get("title", "")).strip()
         if t:
-            titles.append(t)
-    # de-dup while preserving order
-    seen, out = set(), []
-    for t in titles:
-        if t not in seen:
-            seen.add(t)
-            out.append(t)
-    return sorted(out, key=lambda x: x.lower())
+            titles.add(t)
+    # tuple: the catalogue is read-only for the rest of the script
+    return tuple(sorted(titles, key=lambda x: (x.lower(), x)))
 
 
 # ------------ Signups & Claims (Firestore) ------------
 @st.cache_data(ttl=10, show_spinner=False)
 def fs_signups_df() -> pd.DataFrame:
     """Return all current active signups as a DataFrame (host view)."""
-    docs = list(db.collection(COL_SIGNUPS).stream())
     rows = []
-    for d in docs:
+    for d in db.collection(COL_SIGNUPS).stream():  # consume the stream; no list of snapshots held alongside rows
         data = d.to_dict() or {}
         row = {
             "id": d.id,  # typically phone digits
             "timestamp": data.get("timestamp", ""),
             "name": str(data.get("name", "")),
-            "phone": "".join(ch for ch in str(data.get("phone", "")) if ch.isdigit()),
+            "phone": digits_only(data.get("phone", "")),
             "instagram": str(data.get("instagram", "")),
             "song": str(data.get("song", "")),
             "suggestion": str(data.get("suggestion", "")),
         }
         rows.append(row)
-    if not rows:
-        return pd.DataFrame(columns=["id"] + HEADERS)
-    df = pd.DataFrame(rows)
-    for col in ["id"] + HEADERS:
-        if col not in df.columns:
-            df[col] = ""
-    return df[["id"] + HEADERS]
+    # Every row carries every column, so the schema is fixed once here (also covers the empty case)
+    return pd.DataFrame(rows, columns=["id", *HEADERS])
 
 
 @st.cache_data(ttl=2, show_spinner=False, max_entries=8)
@@ -228,8 +255,11 @@ def fs_find_signup_by_phone(phone_digits: str) -> Optional[Dict[str, str]]:
         rec = snap.to_dict() or {}
         rec["id"] = snap.id
         return rec
+    return _fs_find_legacy_signup(phone_digits)
 
-    # Legacy fallback (safe to keep)
+
+def _fs_find_legacy_signup(phone_digits: str) -> Optional[Dict[str, str]]:
+    """Legacy fallback (safe to keep): query by field for older random-id signups."""
     q = db.collection(COL_SIGNUPS).where("phone", "==", phone_digits).limit(1).stream()
     for d in q:
         rec = d.to_dict() or {}
@@ -238,13 +268,21 @@ def fs_find_signup_by_phone(phone_digits: str) -> Optional[Dict[str, str]]:
     return None
 
 
-def fs_is_song_claimed(song_title: str) -> bool:
-    """Strong check: exists in song_claims (atomic uniqueness)."""
-    if not song_title:
-        return False
-    sid = song_doc_id(song_title)
-    snap = db.collection(COL_SONG_CLAIMS).document(sid).get()
-    return snap.exists
+def fs_signup_conflicts(phone_digits: str, song_title: str) -> Tuple[bool, bool]:
+    """
+    Pre-submit strong check -> (phone_has_active_signup, song_claimed).
+    Both primary docs come back from ONE batched get_all instead of two point reads;
+    the legacy phone query only runs when the phone doc is missing and the song is free.
+    """
+    signup_ref = db.collection(COL_SIGNUPS).document(phone_digits)
+    claim_ref = db.collection(COL_SONG_CLAIMS).document(song_doc_id(song_title))
+    exists = {snap.reference.path: snap.exists for snap in db.get_all([signup_ref, claim_ref])}
+
+    song_claimed = exists.get(claim_ref.path, False)
+    phone_taken = exists.get(signup_ref.path, False)
+    if not phone_taken and not song_claimed:
+        phone_taken = _fs_find_legacy_signup(phone_digits) is not None
+    return phone_taken, song_claimed
 
 
 @firestore.transactional
@@ -298,23 +336,44 @@ def fs_delete_signup_by_id(doc_id: str) -> bool:
     IMPORTANT: we do NOT delete the song claim because songs can't repeat this night.
     """
     try:
-        ref = db.collection(COL_SIGNUPS).document(doc_id)
-        snap = ref.get()
-        if not snap.exists:
-            return False
-        ref.delete()
+        # exists=True precondition: a missing doc raises NotFound instead of costing a separate get()
+        db.collection(COL_SIGNUPS).document(doc_id).delete(option=db.write_option(exists=True))
         return True
     except Exception:
         return False
 
 
+def fs_delete_collections(*col_names: str) -> Tuple[int, int]:
+    """
+    Delete every doc in the given collections through ONE BulkWriter.
+    Docs are independent, so BulkWriter sends small batches (20 ops) concurrently, rate-limited
+    to 500 ops/s, instead of one sequential commit per collection.
+    Failed deletes are retried at most RESET_MAX_RETRIES times so a bad reset fails fast.
+    Returns (queued, deleted); deleted counts only writes the server confirmed.
+    """
+    queued = 0
+    confirmed: List[int] = []  # appended from BulkWriter worker threads; list.append is atomic
+    bw = db.bulk_writer()
+    bw.on_write_result(lambda ref, result, writer: confirmed.append(1))
+    # BulkWriteFailure.attempts counts prior retries (0 on the first failure)
+    bw.on_write_error(lambda error, writer: error.attempts < RESET_MAX_RETRIES)
+    for col_name in col_names:
+        for d in db.collection(col_name).stream():
+            bw.delete(d.reference)
+            queued += 1
+    bw.close()  # flushes and waits for every in-flight commit
+    return queued, len(confirmed)
+
+
 # ------------ Targeted cache invalidation ------------
-def _invalidate_data_caches():
+def _invalidate_data_caches(claims: bool = True):
     """Only clear the data caches that reflect signups/claimed songs."""
     try:
         fs_signups_df.clear()
     except Exception:
         pass
+    if not claims:
+        return
     try:
         fs_claimed_songs.clear()
     except Exception:
@@ -322,22 +381,44 @@ def _invalidate_data_caches():
 
 
 # ------------ UI Header ------------
+LOGO_PATH = Path(__file__).resolve().parent / "logo.png"
+LOGO_MAX_WIDTH = 1460  # st.image's MAXIMUM_CONTENT_WIDTH; wider images are resized + re-encoded on every call
+
+
+@st.cache_resource
+def logo_bytes(mtime_ns: int) -> bytes:
+    """
+    Downscale the logo to LOGO_MAX_WIDTH and encode it as PNG once per file version (keyed on mtime).
+    st.image then passes the bytes through instead of decoding/resizing the full-size PNG every rerun.
+    """
+    with Image.open(LOGO_PATH) as img:
+        if img.width > LOGO_MAX_WIDTH:
+            height = round(img.height * LOGO_MAX_WIDTH / img.width)
+            img = img.resize((LOGO_MAX_WIDTH, height), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
 col_l, col_c, col_r = st.columns([1, 2, 1])
 with col_c:
-    logo_path = Path(__file__).resolve().parent / "logo.png"
-    if logo_path.exists():
-        st.image(str(logo_path))
+    # stat() runs every rerun like the old exists() check; a miss (or unreadable image) raises and is never cached
+    try:
+        _logo = logo_bytes(LOGO_PATH.stat().st_mtime_ns)
+    except OSError:
+        _logo = None
+    if _logo:
+        st.image(_logo)
     else:
         st.caption(" ")
-        st.warning(f"Logo not found at {logo_path.name}. Put logo.png next to karaoke_app.py or update the path.")
+        st.warning(f"Logo not found at {LOGO_PATH.name}. Put logo.png next to karaoke_app.py or update the path.")
 
-st.markdown("<h1 style='text-align:center;margin:0;'>Song Selection</h1>", unsafe_allow_html=True)
-st.markdown(
-    "<p style='text-align:center;margin:0;'>One song at a time per person. Songs can only be chosen once per night.</p>",
-    unsafe_allow_html=True,
-)
+# One markdown block = one frontend delta per rerun for the static header.
+# The 1rem top margins stand in for the gap Streamlit used to put between the three separate elements.
 st.markdown(
-    "<p style='text-align:center;margin:6px 0;'><a href='https://instagram.com/losemoskaraoke' target='_blank'>Follow us on Instagram</a></p>",
+    "<h1 style='text-align:center;margin:0;'>Song Selection</h1>"
+    "<p style='text-align:center;margin:1rem 0 0;'>One song at a time per person. Songs can only be chosen once per night.</p>"
+    "<p style='text-align:center;margin:calc(1rem + 6px) 0 6px;'><a href='https://instagram.com/losemoskaraoke' target='_blank'>Follow us on Instagram</a></p>",
     unsafe_allow_html=True,
 )
 st.divider()
@@ -346,8 +427,8 @@ st.divider()
 if st.session_state.get("signup_success"):
     _msg = st.session_state["signup_success"]
     if isinstance(_msg, dict) and _msg.get("song"):
-        who = f" { _msg.get('name','') }" if _msg.get("name") else ""
-        st.success(f"You're in{who}! You've signed up to sing '{_msg['song']}'.")
+        who = f" { md_escape(_msg.get('name','')) }" if _msg.get("name") else ""
+        st.success(f"You're in{who}! You've signed up to sing '{md_escape(_msg['song'])}'.")
         if st.button("Dismiss", key="dismiss_success"):
             st.session_state["signup_success"] = None
             st.rerun()
@@ -356,8 +437,8 @@ if st.session_state.get("signup_success"):
 if st.session_state.get("undo_success"):
     _umsg = st.session_state["undo_success"]
     if isinstance(_umsg, dict) and _umsg.get("song"):
-        name_txt = f" for {_umsg.get('name','')}" if _umsg.get("name") else ""
-        st.success(f"Removed your signup{name_txt}: '{_umsg['song']}'.")
+        name_txt = f" for {md_escape(_umsg.get('name',''))}" if _umsg.get("name") else ""
+        st.success(f"Removed your signup{name_txt}: '{md_escape(_umsg['song'])}'.")
         if st.button("Dismiss", key="dismiss_undo_success"):
             st.session_state["undo_success"] = None
             st.rerun()
@@ -370,7 +451,15 @@ if not all_songs:
     st.warning("No songs found in the songs collection.")
 
 claimed_songs = fs_claimed_songs()
+# Overlay this session's just-made claim until the short-lived claims cache catches up
+_pending_claims = {
+    s: t for s, t in st.session_state.get("pending_claims", {}).items() if time.time() - t < PENDING_CLAIM_TTL
+}
+st.session_state["pending_claims"] = _pending_claims
+if _pending_claims:
+    claimed_songs = claimed_songs | set(_pending_claims)
 available_songs = [s for s in all_songs if s and s not in claimed_songs]
+available_set = set(available_songs)  # membership checks in the form; the list keeps display order
 
 with st.form("signup_form", clear_on_submit=False):
     name = st.text_input("Your Name", max_chars=60)
@@ -416,7 +505,7 @@ with st.form("signup_form", clear_on_submit=False):
     attempted_song = current_choice or prev_choice
 
     # Detect “vanished” selection (someone else claimed it) AFTER rendering widget
-    vanished = bool(prev_choice and (prev_choice not in available_songs) and (current_choice in ("", None)))
+    vanished = bool(prev_choice and (prev_choice not in available_set) and (current_choice in ("", None)))
 
     submit = st.form_submit_button("Submit Signup")
 
@@ -428,16 +517,20 @@ with st.form("signup_form", clear_on_submit=False):
             errs.append("Please enter a valid US phone (10 digits; country code '1' is OK).")
 
         if vanished:
-            errs.append(f"Sorry, '{prev_choice}' was just claimed. Pick another.")
+            errs.append(f"Sorry, '{md_escape(prev_choice)}' was just claimed. Pick another.")
         else:
             if not attempted_song:
                 errs.append("Please select a song.")
-            elif (attempted_song in claimed_songs) or fs_is_song_claimed(attempted_song):
-                errs.append(f"Sorry, '{attempted_song}' was already claimed tonight. Pick another.")
+            elif attempted_song in claimed_songs:
+                errs.append(f"Sorry, '{md_escape(attempted_song)}' was already claimed tonight. Pick another.")
 
-            # only one active signup at a time per phone
-            if not errs and fs_find_signup_by_phone(digits):
-                errs.append("This phone number already has an active signup. Wait until you sing, then sign up again!")
+            # strong checks (one batched read): song unclaimed, and only one active signup per phone
+            if not errs:
+                phone_taken, song_taken = fs_signup_conflicts(digits, attempted_song)
+                if song_taken:
+                    errs.append(f"Sorry, '{md_escape(attempted_song)}' was already claimed tonight. Pick another.")
+                elif phone_taken:
+                    errs.append("This phone number already has an active signup. Wait until you sing, then sign up again!")
 
         if errs:
             for e in errs:
@@ -446,15 +539,17 @@ with st.form("signup_form", clear_on_submit=False):
             ok = fs_add_signup(name.strip(), digits, instagram.strip(), attempted_song, suggestion.strip())
             if ok:
                 st.session_state["signup_success"] = {"song": attempted_song, "name": name.strip()}
-                _invalidate_data_caches()
+                # We know exactly which song was claimed; no need to re-stream song_claims on rerun
+                st.session_state.setdefault("pending_claims", {})[attempted_song] = time.time()
+                _invalidate_data_caches(claims=False)
                 st.rerun()
             else:
                 st.error(
-                    f"Could not save your signup — either your phone already has an active signup, or '{attempted_song}' was already claimed tonight."
+                    f"Could not save your signup — either your phone already has an active signup, or '{md_escape(attempted_song)}' was already claimed tonight."
                 )
 
     if (not submit) and vanished and not st.session_state.get("signup_success"):
-        st.warning(f"Looks like '{prev_choice}' was just claimed by another singer. Please pick another.")
+        st.warning(f"Looks like '{md_escape(prev_choice)}' was just claimed by another singer. Please pick another.")
 
 # Undo signup
 with st.expander("Undo My Signup"):
@@ -478,17 +573,7 @@ with st.expander("Undo My Signup"):
                     key_to_release = key_from_record(
                         {"name": rec.get("name", ""), "phone": rec.get("phone", ""), "song": rec.get("song", "")}
                     )
-                    changed = False
-                    if state_cleanup.get("now_key") == key_to_release:
-                        state_cleanup["now_key"] = None
-                        changed = True
-                    if key_to_release in state_cleanup.get("order_keys", []):
-                        state_cleanup["order_keys"] = [k for k in state_cleanup["order_keys"] if k != key_to_release]
-                        changed = True
-                    if key_to_release in state_cleanup.get("used_keys", []):
-                        state_cleanup["used_keys"] = [k for k in state_cleanup["used_keys"] if k != key_to_release]
-                        changed = True
-                    if changed:
+                    if drop_key_from_state(state_cleanup, key_to_release):
                         bump_version(state_cleanup)
                         fs_write_state(state_cleanup)
 
@@ -508,27 +593,37 @@ if all_songs:
     lines = []
     for s in all_songs:
         if s in claimed_songs:
-            lines.append(f"- ~~{s}~~")
+            lines.append(f"- ~~{md_escape(s)}~~")
         else:
-            lines.append(f"- {s}")
+            lines.append(f"- {md_escape(s)}")
     st.markdown("\n".join(lines))
 else:
     st.caption("No songs found yet.")
 
 
 # ------------ Host Controls (shared via Firestore) ------------
-def _row_key(rec: Dict[str, str]) -> tuple:
-    return key_from_record(rec)
+@st.cache_data(show_spinner=False, max_entries=4)
+def _signups_csv(queue_df: pd.DataFrame) -> bytes:
+    """CSV for the host download, keyed on the same queue_df snapshot the host view shows."""
+    # Write UTF-8 bytes straight into the buffer: no intermediate str, no re-encode in download_button
+    buf = io.BytesIO()
+    queue_df[list(HEADERS)].to_csv(buf, index=False, encoding="utf-8")
+    return buf.getvalue()
 
 
 def _df_with_keys(dfin: pd.DataFrame) -> pd.DataFrame:
     df2 = dfin.copy()
-    df2["__key__"] = df2.apply(lambda r: _row_key(r), axis=1)
+    # Vectorized key_from_record: fs_signups_df already reduced phone to digits
+    df2["__key__"] = list(zip(df2["name"].str.strip().str.lower(), df2["phone"], df2["song"].str.strip()))
     return df2
 
 
-def _keys_from_df(df_keys: pd.DataFrame, keys: List[tuple]) -> List[Dict[str, str]]:
-    pool = {k: rec for k, rec in zip(df_keys["__key__"], df_keys.to_dict("records"))}
+def _records_by_key(df_keys: pd.DataFrame) -> Dict[tuple, Dict[str, str]]:
+    """Build the key -> record lookup once per rerun; records keep their "__key__" for reuse."""
+    return {k: rec for k, rec in zip(df_keys["__key__"], df_keys.to_dict("records"))}
+
+
+def _keys_from_pool(pool: Dict[tuple, Dict[str, str]], keys: List[tuple]) -> List[Dict[str, str]]:
     return [pool[k] for k in keys if k in pool]
 
 
@@ -640,18 +735,18 @@ def skip_singer_txn(transaction, choice_type, choice_key):
         return "current"
 
     else:
-        if choice_key in order_keys:
-            old_pos = order_keys.index(choice_key)
-            new_pos = min(old_pos + 2, len(order_keys))
-            order_keys.pop(old_pos)
-            order_keys.insert(new_pos, choice_key)
-
-            state["order_keys"] = order_keys
-            bump_version(state)
-            fs_write_state(state, transaction=transaction)
-            return "next"
-        else:
+        try:
+            old_pos = order_keys.index(choice_key)  # one scan doubles as the membership test
+        except ValueError:
             return None
+        new_pos = min(old_pos + 2, len(order_keys))
+        order_keys.pop(old_pos)
+        order_keys.insert(new_pos, choice_key)
+
+        state["order_keys"] = order_keys
+        bump_version(state)
+        fs_write_state(state, transaction=transaction)
+        return "next"
 
 
 @firestore.transactional
@@ -668,10 +763,10 @@ def promote_to_now_txn(transaction, choice_key: tuple):
     if choice_key == now_key:
         return "already_now"
 
-    order_keys = [k for k in order_keys if k != choice_key]
+    drop = {choice_key, now_key} if now_key else {choice_key}
+    order_keys = [k for k in order_keys if k not in drop]
 
     if now_key:
-        order_keys = [k for k in order_keys if k != now_key]
         order_keys.insert(0, now_key)
 
     state["now_key"] = choice_key
@@ -709,7 +804,8 @@ with st.expander("Host Controls"):
             st.rerun()
 
         df_all = fs_signups_df()
-        queue_df = df_all[df_all["song"].astype(str).str.len() > 0].fillna("")
+        # fs_signups_df already stores song as str; filter first, then fill only the kept rows
+        queue_df = df_all[df_all["song"] != ""].fillna("")
         queue_df_k = _df_with_keys(queue_df)
         all_keys_set = set(queue_df_k["__key__"])
 
@@ -734,23 +830,25 @@ with st.expander("Host Controls"):
             except Exception:
                 order_keys = order_keys_normalized + new_candidates
 
-        # Build records
-        order_records = _keys_from_df(queue_df_k, order_keys)
-        rp = {k: rec for k, rec in zip(queue_df_k["__key__"], queue_df_k.to_dict("records"))}
+        # Build records (one key -> record pool shared by every view below)
+        rp = _records_by_key(queue_df_k)
+        order_records = _keys_from_pool(rp, order_keys)
         now_record = rp.get(now_key) if now_key else None
 
         st.subheader("Now Singing")
         if now_record:
             n = str(now_record.get("name", "")).strip()
             s = str(now_record.get("song", "")).strip()
-            st.markdown(f"**{n}** — *{s}*")
+            st.markdown(f"**{md_escape(n)}** — *{md_escape(s)}*")
         else:
             st.caption("No one is currently singing.")
 
         next_slice = order_records[:3]
         if next_slice:
             st.subheader("Up Next (Next 3)")
-            lines_up = [f"- {i+1}. {r.get('name','')} — {r.get('song','')}" for i, r in enumerate(next_slice)]
+            lines_up = [
+                f"- {i+1}. {md_escape(r.get('name',''))} — {md_escape(r.get('song',''))}" for i, r in enumerate(next_slice)
+            ]
             st.markdown("\n".join(lines_up))
         else:
             st.caption("No upcoming singers.")
@@ -767,7 +865,9 @@ with st.expander("Host Controls"):
                 if new_now_key:
                     rec = rp.get(new_now_key)
                     if rec:
-                        st.success(f"Now calling {str(rec.get('name','')).strip()} — {str(rec.get('song','')).strip()}")
+                        n = md_escape(str(rec.get("name", "")).strip())
+                        s = md_escape(str(rec.get("song", "")).strip())
+                        st.success(f"Now calling {n} — {s}")
                     else:
                         st.success("Now calling the next singer.")
                 else:
@@ -778,24 +878,21 @@ with st.expander("Host Controls"):
                 st.error(f"Error calling next singer (transaction failed): {e}")
 
         st.subheader("Skip")
-        skip_options = []
-        skip_keys = []
+        skip_choices: Dict[str, tuple] = {}  # label -> (type, key); labels are unique per position
 
         if now_record and now_key:
             label_cur = f"Current: {now_record.get('name','')} — {now_record.get('song','')}"
-            skip_options.append(label_cur)
-            skip_keys.append(("current", now_key))
+            skip_choices[label_cur] = ("current", now_key)
 
         for i, r in enumerate(next_slice):
             label_n = f"Next {i+1}: {r.get('name','')} — {r.get('song','')}"
-            skip_options.append(label_n)
-            skip_keys.append(("next", key_from_record(r)))
+            skip_choices[label_n] = ("next", r["__key__"])
 
-        if skip_options:
-            sel = st.selectbox("Choose who to skip", options=skip_options, index=0, key="unified_skip_choice")
+        if skip_choices:
+            sel = st.selectbox("Choose who to skip", options=list(skip_choices), index=0, key="unified_skip_choice")
             if st.button("Skip Selected"):
                 try:
-                    choice_type, choice_key = skip_keys[skip_options.index(sel)]
+                    choice_type, choice_key = skip_choices[sel]
                     transaction = db.transaction()
                     result = skip_singer_txn(transaction, choice_type, choice_key)
 
@@ -811,24 +908,22 @@ with st.expander("Host Controls"):
             st.caption("No one available to skip.")
 
         st.subheader("Call Someone Now (Manual)")
-        manual_options = []
-        manual_keys = []
+        manual_choices: Dict[str, tuple] = {}  # label -> key; a song is claimed once, so labels are unique
         for r in order_records:
             ph = str(r.get("phone", ""))
             last4 = f" (…{ph[-4:]})" if ph else ""
-            manual_options.append(f"{r.get('name','')} — {r.get('song','')}{last4}")
-            manual_keys.append(key_from_record(r))
+            manual_choices[f"{r.get('name','')} — {r.get('song','')}{last4}"] = r["__key__"]
 
-        if manual_options:
+        if manual_choices:
             sel_manual = st.selectbox(
                 "Choose a singer to call now",
-                options=["— select —"] + manual_options,
+                options=["— select —"] + list(manual_choices),
                 index=0,
                 key="manual_call_choice",
             )
             if sel_manual != "— select —" and st.button("Call Selected Now"):
                 try:
-                    choice_key = manual_keys[manual_options.index(sel_manual)]
+                    choice_key = manual_choices[sel_manual]
                     transaction = db.transaction()
                     result = promote_to_now_txn(transaction, choice_key)
                     if result == "already_now":
@@ -859,67 +954,66 @@ with st.expander("Host Controls"):
             showing = st.session_state["show_full_list"]
 
         if showing:
-            remaining = _keys_from_df(queue_df_k, order_keys)
+            remaining = order_records  # same pool + order_keys as above; no need to rebuild
             if remaining:
                 st.subheader("Remaining (in order)")
-                lines = [f"- {i+1}. {r.get('name','')} — {r.get('song','')}" for i, r in enumerate(remaining)]
+                lines = [
+                    f"- {i+1}. {md_escape(r.get('name',''))} — {md_escape(r.get('song',''))}"
+                    for i, r in enumerate(remaining)
+                ]
                 st.markdown("\n".join(lines))
             else:
                 st.caption("No remaining signups.")
 
         st.subheader("Release a Signup (Song stays claimed tonight)")
-        if not queue_df.empty:
-            id_to_data = {}
-            for _, r in queue_df.iterrows():
-                doc_id = r["id"]
-                display_label = f"{r['name']} — {r['song']} (…{str(r['phone'])[-4:]})"
-                id_to_data[doc_id] = {
-                    "label": display_label,
-                    "key": key_from_record({"name": r["name"], "phone": r["phone"], "song": r["song"]}),
+        # Options are built from every signup row, so only pay for it while the host has it open
+        releasing = st.session_state.get("show_release", False)
+        release_label = "Hide Release Controls" if releasing else "Show Release Controls"
+        if st.button(release_label, key="toggle_release"):
+            st.session_state["show_release"] = not releasing
+            releasing = st.session_state["show_release"]
+
+        if releasing:
+            if not queue_df.empty:
+                # Vectorized labels + keys already computed in queue_df_k (no per-row key_from_record)
+                labels = (
+                    queue_df_k["name"] + " — " + queue_df_k["song"] + " (…" + queue_df_k["phone"].str[-4:] + ")"
+                )
+                id_to_data = {
+                    doc_id: {"label": label, "key": key}
+                    for doc_id, label, key in zip(queue_df_k["id"], labels, queue_df_k["__key__"])
                 }
 
-            options = [""] + list(id_to_data.keys())
-            release_choice = st.selectbox(
-                "Select signup to remove",
-                options=options,
-                index=0,
-                format_func=lambda doc_id: "— select —" if doc_id == "" else id_to_data[doc_id]["label"],
-            )
-
-            confirm_release = st.checkbox("Yes, remove this signup", key="confirm_release_signup")
-            if release_choice and confirm_release and st.button("Remove Selected Signup"):
-                doc_id_to_release = release_choice
-                key_to_release = id_to_data[doc_id_to_release]["key"]
-                ok = fs_delete_signup_by_id(doc_id_to_release)
-                if ok:
-                    state_cleanup = fs_read_state()
-                    changed = False
-                    if state_cleanup.get("now_key") == key_to_release:
-                        state_cleanup["now_key"] = None
-                        changed = True
-                    if key_to_release in state_cleanup.get("order_keys", []):
-                        state_cleanup["order_keys"] = [k for k in state_cleanup["order_keys"] if k != key_to_release]
-                        changed = True
-                    if key_to_release in state_cleanup.get("used_keys", []):
-                        state_cleanup["used_keys"] = [k for k in state_cleanup["used_keys"] if k != key_to_release]
-                        changed = True
-
-                    if changed:
-                        bump_version(state_cleanup)
-                        fs_write_state(state_cleanup)
+                options = [""] + list(id_to_data.keys())
+                release_choice = st.selectbox(
+                    "Select signup to remove",
+                    options=options,
+                    index=0,
+                    format_func=lambda doc_id: "— select —" if doc_id == "" else id_to_data[doc_id]["label"],
+                )
 
-                    st.success("Signup removed. (Song remains claimed for tonight.)")
-                    _invalidate_data_caches()
-                    st.rerun()
-                else:
-                    st.error("Could not delete the signup. Try again.")
-        else:
-            st.caption("No signups yet.")
+                confirm_release = st.checkbox("Yes, remove this signup", key="confirm_release_signup")
+                if release_choice and confirm_release and st.button("Remove Selected Signup"):
+                    doc_id_to_release = release_choice
+                    key_to_release = id_to_data[doc_id_to_release]["key"]
+                    ok = fs_delete_signup_by_id(doc_id_to_release)
+                    if ok:
+                        state_cleanup = fs_read_state()
+                        if drop_key_from_state(state_cleanup, key_to_release):
+                            bump_version(state_cleanup)
+                            fs_write_state(state_cleanup)
+
+                        st.success("Signup removed. (Song remains claimed for tonight.)")
+                        _invalidate_data_caches()
+                        st.rerun()
+                    else:
+                        st.error("Could not delete the signup. Try again.")
+            else:
+                st.caption("No signups yet.")
 
         # DOWNLOAD CSV (active signups only)
-        csv_df = queue_df[["timestamp", "name", "phone", "instagram", "song", "suggestion"]].copy()
         st.download_button(
-            "Download Active Signups CSV", data=csv_df.to_csv(index=False), file_name="signups_active.csv", mime="text/csv"
+            "Download Active Signups CSV", data=_signups_csv(queue_df), file_name="signups_active.csv", mime="text/csv"
         )
 
         # RESET FOR NEXT EVENT
@@ -927,23 +1021,8 @@ with st.expander("Host Controls"):
         st.warning("This will permanently delete all signups, song claims, performed history, and host state!")
         if st.checkbox("Yes, clear everything for a new event", key="confirm_reset_checkbox"):
             if st.button("Reset Now", key="final_reset_button"):
-                # delete all signups
-                batch = db.batch()
-                for d in db.collection(COL_SIGNUPS).stream():
-                    batch.delete(d.reference)
-                batch.commit()
-
-                # delete all song_claims (new night)
-                batch2 = db.batch()
-                for d in db.collection(COL_SONG_CLAIMS).stream():
-                    batch2.delete(d.reference)
-                batch2.commit()
-
-                # delete all performed history (new night)
-                batch3 = db.batch()
-                for d in db.collection(COL_PERFORMED).stream():
-                    batch3.delete(d.reference)
-                batch3.commit()
+                # delete all signups, song_claims and performed history (new night)
+                queued, deleted = fs_delete_collections(COL_SIGNUPS, COL_SONG_CLAIMS, COL_PERFORMED)
 
                 # reset host state
                 fs_write_state(
@@ -955,17 +1034,15 @@ with st.expander("Host Controls"):
                     }
                 )
 
-                try:
-                    _invalidate_data_caches()
-                except Exception:
-                    pass
-                try:
-                    st.cache_resource.clear()
-                except Exception:
-                    pass
+                # Only signup/claim caches are stale now; the client, logo and song catalogue stay warm
+                _invalidate_data_caches()
 
-                st.success("Cleared. Ready for the next event.")
-                st.rerun()
+                if deleted < queued:
+                    # Don't claim success on a partial reset; leave the message up so the host can retry
+                    st.error(f"Only {deleted} of {queued} records were deleted. Press Reset Now again to finish.")
+                else:
+                    st.success("Cleared. Ready for the next event.")
+                    st.rerun()
 
 st.caption("Los Emos Karaoke — built with Streamlit.")
 st.caption(f"Build revision: {os.getenv('K_REVISION','unknown')}")